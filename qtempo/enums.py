@@ -54,6 +54,7 @@ class UserRole(Enum):
 
 class QTreeWidgetItemRole(UserRole):
     NODE = auto()
+    NODE_LOWER = auto()
 
 
 class QListWidgetItemRole(UserRole):
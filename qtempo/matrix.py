@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 import collections.abc as c
+import io
 import operator
-import re
+import sys
 import typing as t
-from collections import UserList
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import compress, repeat
 
-from qgis.core import QgsFeature, QgsField, QgsFields, QgsVectorLayer, edit
+from qgis.core import QgsFeature, QgsField, QgsFields, QgsVectorLayer
 from qgis.PyQt.QtCore import QVariant
 
 from ._typing import RequestBody
 
 
-@dataclass
+def parse_value(value: str | None) -> float | None:
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        # Missing cells and TEMPO's placeholders (e.g. ':' or '-')
+        return None
+
+
+@dataclass(frozen=True, slots=True)
 class Field:
     name: str
     is_time: bool = False
@@ -22,70 +32,101 @@ class Field:
     is_jud: bool = False
     is_loc: bool = False
 
-    def __eq__(self, field: object) -> bool:
-        if isinstance(field, Field):
-            return self.name == field.name
-        return self.name == field
-
-    def __hash__(self) -> int:
-        return hash(self.name)
-
     @property
     def is_geo(self):
         return self.is_reg or self.is_jud or self.is_loc
 
 
-@dataclass
-class Fields(UserList[Field]):
-    data: list[Field]
+class Fields:
+    __slots__ = ('data', '_by_name', '_by_flag', '_index')
+
+    def __init__(self, data: list[Field]):
+        self.data = data
+        self._by_name: dict[str, Field] = {}
+        self._by_flag: dict[str, Field] = {}
+        self._index: dict[Field, int] = {}
+        for i, field_ in enumerate(data):
+            self._by_name.setdefault(field_.name, field_)
+            self._index.setdefault(field_, i)
+            for flag in ('time', 'value', 'reg', 'jud', 'loc'):
+                if getattr(field_, f'is_{flag}'):
+                    self._by_flag.setdefault(flag, field_)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(data={self.data!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Fields):
+            return self.data == other.data
+        return NotImplemented
+
+    def __iter__(self) -> c.Iterator[Field]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Field:
+        return self.data[index]
+
+    def _get_flagged(self, flag: str) -> Field:
+        try:
+            return self._by_flag[flag]
+        except KeyError:
+            raise ValueError(f'No {flag!r} field found') from None
 
     @property
     def time(self) -> Field:
-        for field_ in self.data:
-            if field_.is_time:
-                return field_
-        raise ValueError
+        return self._get_flagged('time')
 
     @property
     def value(self) -> Field:
-        for field_ in self.data:
-            if field_.is_value:
-                return field_
-        raise ValueError
+        return self._get_flagged('value')
 
     @property
     def reg(self) -> Field:
-        for field_ in self.data:
-            if field_.is_reg:
-                return field_
-        raise ValueError
+        return self._get_flagged('reg')
 
     @property
     def jud(self) -> Field:
-        for field_ in self.data:
-            if field_.is_jud:
-                return field_
-        raise ValueError
+        return self._get_flagged('jud')
 
     @property
     def loc(self) -> Field:
-        for field_ in self.data:
-            if field_.is_loc:
-                return field_
-        raise ValueError
+        return self._get_flagged('loc')
 
     def get(self, name: str) -> Field:
-        for field_ in self.data:
-            if field_.name == name:
-                return field_
-        raise ValueError
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise ValueError(f'Field {name!r} not found') from None
+
+    def index(self, field_: Field) -> int:
+        try:
+            return self._index[field_]
+        except KeyError:
+            raise ValueError(f'{field_!r} is not in fields') from None
 
 
 @dataclass
 class Matrix(c.Mapping):
-    data: list[list[t.Any]]
+    # The values are stored column-wise, in the same order as the fields
+    columns: list[list[t.Any]]
     fields: Fields
     siruta: list[SIRUTA | None] | None = None
+    _unique_values: dict[Field, list[t.Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _parsed_values: dict[Field, list[float | None]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # The columns keep the raw cell text for the table preview, the
+        # numbers are parsed once here rather than on every export
+        for field_, column in zip(self.fields, self.columns):
+            if field_.is_value:
+                self._parsed_values[field_] = list(map(parse_value, column))
 
     def __iter__(self) -> c.Iterator[Field]:
         return iter(self.fields)
@@ -93,41 +134,55 @@ class Matrix(c.Mapping):
     def __len__(self) -> int:
         return len(self.fields)
 
-    def __getitem__(self, field: str | Field) -> list[t.Any]:
-        if isinstance(field, Field):
-            col_index = self.fields.index(field)
-        else:
-            col_index = 1
-        return list(map(operator.itemgetter(col_index), self.data))
+    def __getitem__(self, key: str | Field) -> list[t.Any]:
+        try:
+            field_ = self.fields.get(key) if isinstance(key, str) else key
+            col_index = self.fields.index(field_)
+        except ValueError:
+            raise KeyError(key) from None
+        return self.columns[col_index]
 
     @property
+    def row_count(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    @cached_property
     def has_siruta(self) -> bool:
         # This will return False if siruta is either empty or None
         if self.siruta is not None:
-            not_na = [value for value in self.siruta if value is not None]
-            return bool(not_na)
+            return any(value is not None for value in self.siruta)
         return False
 
     @staticmethod
-    def parse_query_response(response: str) -> dict[str, list[t.Any]]:
-        lines_split = iter(response.splitlines())
-        columns = next(lines_split).split(', ')
-        data: dict[str, list[t.Any]] = {column: [] for column in columns}
-        for line in lines_split:
-            values = line.split(', ')
-            for i, value in enumerate(values):
-                data[columns[i]].append(value)
-        return data
+    def parse_query_response(
+        response: c.Iterable[str],
+    ) -> tuple[list[str], list[list[t.Any]]]:
+        lines = (line.rstrip('\r\n') for line in response)
+        columns = next(lines).split(', ')
+        # Labels repeat across most rows, so they are interned. The last
+        # column always holds the values, which are kept as the raw cell
+        # text so placeholders stay visible in the table preview.
+        intern = sys.intern
+        rows = [
+            [*map(intern, labels), value]
+            for *labels, value in (line.split(', ') for line in lines if line)
+        ]
+        return (columns, rows)
 
     @classmethod
     def from_response(
         cls, response: bytes, request_body: RequestBody
     ) -> t.Self:
-        data = cls.parse_query_response(response.decode(encoding='UTF-8'))
+        # Decode line by line rather than materializing the whole payload
+        # as a str and then again as a list of lines.
+        header, rows = cls.parse_query_response(
+            io.TextIOWrapper(io.BytesIO(response), encoding='UTF-8')
+        )
+        columns = list(map(list, zip(*rows))) or [[] for _ in header]
 
         def get_fields() -> Fields:
             fields = []
-            for i, field_ in enumerate(data, start=1):
+            for i, field_ in enumerate(header, start=1):
                 if i == request_body['matTime']:
                     fields.append(Field(field_, is_time=True))
                 elif i == request_body['matRegJ']:
@@ -136,24 +191,23 @@ class Matrix(c.Mapping):
                     fields.append(Field(field_, is_jud=True))
                 elif i == request_body['nomLoc']:
                     fields.append(Field(field_, is_loc=True))
-                elif i == len(data):
+                elif i == len(header):
                     fields.append(Field(field_, is_value=True))
                 else:
                     fields.append(Field(field_))
             return Fields(fields)
 
         fields = get_fields()
-        rows = [list(row) for row in zip(*data.values())]
         if request_body['matSiruta'] == 1:
             loc_index = request_body['nomLoc'] - 1
             siruta: list[SIRUTA | None] = []
-            for row in rows:
+            for value in columns[loc_index]:
                 try:
-                    siruta.append(SIRUTA.from_value(row[loc_index]))
+                    siruta.append(SIRUTA.from_value(value))
                 except ValueError:
                     siruta.append(None)
-            return cls(rows, fields, siruta)
-        return cls(rows, fields)
+            return cls(columns, fields, siruta)
+        return cls(columns, fields)
 
     def as_table(
         self, name: str | None = None, siruta_field_name: str | None = None
@@ -166,7 +220,8 @@ class Matrix(c.Mapping):
         for field_ in self.fields:
             variant = QVariant.Double if field_.is_value else QVariant.String
             attributes.append(QgsField(field_.name, variant))
-        if self.has_siruta:
+        has_siruta = self.has_siruta
+        if has_siruta:
             attributes.append(
                 QgsField(
                     siruta_field_name if siruta_field_name is not None else '',
@@ -177,76 +232,97 @@ class Matrix(c.Mapping):
             raise ValueError(f'Failed to access data provider for a {layer!r}')
         provider.addAttributes(attributes)
         layer.updateFields()
-        features = []
-        for i, row in enumerate(self.data):
-            feature = QgsFeature(attributes)
-            if self.has_siruta:
-                assert self.siruta
-                siruta = self.siruta[i]
-                row.append(siruta.code if siruta is not None else None)
+        columns = [
+            self._parsed_values[field_] if field_.is_value else column
+            for field_, column in zip(self.fields, self.columns)
+        ]
+        rows: c.Iterable[list[t.Any]] = map(list, zip(*columns))
+        if has_siruta:
+            assert self.siruta
+            rows = map(
+                list,
+                zip(
+                    *columns,
+                    (
+                        siruta.code if siruta is not None else None
+                        for siruta in self.siruta
+                    ),
+                ),
+            )
+        # Copies share the prototype's fields instead of rebuilding them
+        prototype = QgsFeature(attributes)
+        features = [QgsFeature(prototype) for _ in range(self.row_count)]
+        for feature, row in zip(features, rows):
             feature.setAttributes(row)
-            features.append(feature)
-        with edit(layer):
-            layer.addFeatures(features)
+        provider.addFeatures(features)
         return layer
 
-    def get_subset(self, siruta: SIRUTA) -> Matrix:
-        assert self.siruta
-        subset = [
-            row
-            for other_siruta, row in zip(self.siruta, self.data)
-            if siruta == other_siruta
-        ]
-        siruta_list: list[SIRUTA | None] = [siruta] * len(subset)
-        return Matrix(subset, self.fields, siruta_list)
+    def unique_values(self, field_: Field) -> list[t.Any]:
+        try:
+            return self._unique_values[field_]
+        except KeyError:
+            values = self._unique_values[field_] = sorted(set(self[field_]))
+            return values
 
     def group_by(
         self,
         group_by: Field,
         table_options: c.Mapping[Field, str],
     ) -> Matrix:
-        fields = Fields(
-            [Field(name, is_value=True) for name in sorted(set(self[group_by]))]
-        )
-
         assert self.siruta
-        siruta_notna = [siruta for siruta in self.siruta if siruta is not None]
+        group_by_column = self[group_by]
+        value_column = self[self.fields.value]
+        filter_columns = [
+            (self[field_], value)
+            for field_, value in table_options.items()
+            if field_ != group_by
+        ]
+
+        # Build the row mask one column at a time, so the comparisons run
+        # in map() rather than in a Python loop per row
+        mask: c.Iterable[bool] = map(operator.is_not, self.siruta, repeat(None))
+        for column, value in filter_columns:
+            mask = map(
+                operator.and_, mask, map(operator.eq, column, repeat(value))
+            )
+        mask = list(mask)
+
+        pivot: dict[tuple[SIRUTA, t.Any], t.Any] = {}
+        keys = zip(compress(self.siruta, mask), compress(group_by_column, mask))
+        for key, value in zip(keys, compress(value_column, mask)):
+            pivot.setdefault(key, value)
+
+        group_values = self.unique_values(group_by)
+        fields = Fields([Field(name, is_value=True) for name in group_values])
         siruta_sorted: list[SIRUTA | None] = sorted(
-            set(siruta_notna), key=operator.attrgetter('code')
+            {siruta for siruta in self.siruta if siruta is not None},
+            key=operator.attrgetter('code'),
         )
+        columns = [
+            [pivot.get((siruta, value)) for siruta in siruta_sorted]
+            for value in group_values
+        ]
+        return Matrix(columns, fields, siruta_sorted)
 
-        rows = []
-        for siruta in siruta_sorted:
-            assert siruta is not None
-            values: list[str | None] = []
-            subset = self.get_subset(siruta)
-            filter_options = dict(table_options)
-            for field_ in fields:
-                if field_.name not in subset[group_by]:
-                    values.append(None)
-                    continue
-                filter_options[group_by] = field_.name
-                for row in subset.data:
-                    if all(
-                        row[subset.fields.index(filter_field)] == value
-                        for filter_field, value in filter_options.items()
-                    ):
-                        values.append(
-                            row[subset.fields.index(subset.fields.value)]
-                        )
-            rows.append(values)
-        return Matrix(rows, fields, siruta_sorted)
-
-
-class SIRUTA(t.NamedTuple):
+
+@dataclass(frozen=True, eq=False, slots=True)
+class SIRUTA:
     place: str
     code: str
     initial_value: str | None = None
 
+    def __eq__(self, other: object) -> bool:
+        # The code alone identifies the administrative unit
+        if isinstance(other, SIRUTA):
+            return self.code == other.code
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
     @classmethod
     def from_value(cls, string: str) -> t.Self:
-        siruta = re.fullmatch(r'(\d+)\s(.+)', string)
-        if siruta is None:
-            raise ValueError(f'Failed to parse SIRUTA from {siruta!r}')
-        groups = siruta.groups()
-        return cls(groups[1], groups[0], string)
+        code, _, place = string.partition(' ')
+        if not code.isdecimal() or not place:
+            raise ValueError(f'Failed to parse SIRUTA from {string!r}')
+        return cls(place, sys.intern(code), string)
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 import collections.abc as c
-import itertools
 import json
 import textwrap
-import time
 import typing as t
 from dataclasses import dataclass, field
+from functools import partial
 from urllib.parse import urljoin
 
 import processing
@@ -17,9 +16,11 @@ from qgis.PyQt.QtCore import (
     QAbstractTableModel,
     QModelIndex,
     QObject,
+    QRunnable,
     QSignalBlocker,
     Qt,
-    QThread,
+    QThreadPool,
+    QTimer,
     QUrl,
     pyqtSignal,
 )
@@ -33,7 +34,6 @@ from qgis.PyQt.QtWidgets import (
     QFrame,
     QHBoxLayout,
     QLabel,
-    QLayout,
     QLineEdit,
     QListWidget,
     QListWidgetItem,
@@ -42,6 +42,7 @@ from qgis.PyQt.QtWidgets import (
     QTabWidget,
     QTreeWidget,
     QTreeWidgetItem,
+    QTreeWidgetItemIterator,
     QVBoxLayout,
     QWidget,
 )
@@ -68,15 +69,15 @@ from .exceptions import RequestError
 from .matrix import Field, Matrix
 from .utils import (
     add_completer_to_combo_box,
+    bulk_update,
     delete_layout_items,
     fix_trailing_whitespace,
-    get_children,
     get_list_widget_items,
-    get_tree_widget_items,
     get_tree_widget_items_r,
-    get_widgets,
     parse_node_name,
+    read_json,
     update_node_ancestors_and_children,
+    updates_disabled,
 )
 from .widgets import LoadingDialog, QListWidgetAlwaysSelected
 
@@ -87,8 +88,38 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
     def __init__(self, qtempo):
         super().__init__()
         self.setupUi(self)
+        # Only the widgets from the .ui file are toggled by set_gui_state;
+        # loading dialogs parented to this dialog later must stay enabled.
+        self._toggleable = tuple(
+            obj for obj in self.children() if isinstance(obj, QWidget)
+        )
         self.qtempo = t.cast(QTempo, qtempo)
         self.request_handler = RequestHandler(self.qtempo.network_manager, self)
+        self._loading_dialog = LoadingDialog(self)
+        # The plugin's long blocking work (parsing, service requests,
+        # processing) gets its own pool, QGIS renders the map on the
+        # global one
+        self._thread_pool = QThreadPool(self)
+        self._last_search = ''
+        self._query_labels: list[QLabel] = []
+        self._query_list_widgets: list[QListWidgetAlwaysSelected] = []
+        # Per dimension, its items grouped by the parent choice id and the
+        # parent ids whose items are currently shown
+        self._query_items_by_parent: list[
+            dict[int | None, list[QListWidgetItem]]
+        ] = []
+        self._query_visible_parents: list[set[int | None]] = []
+        self._table_option_combos: list[QComboBox] = []
+        self._last_group_by: str | None = None
+        self._current_language = self._read_language()
+        self._current_matrix_code: str | None = None
+        # Coalesce bursts of keystrokes into a single filter pass
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(
+            lambda: self.filter_toc(self.lineEditSearch.text())
+        )
 
         # signals
         self.treeWidgetTableOfContents.itemSelectionChanged.connect(
@@ -97,10 +128,16 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         self.treeWidgetTableOfContents.itemSelectionChanged.connect(
             self.reset_tabs
         )
+        # Must run before the other slots, which read the matrix code
+        self.listWidgetMatrices.itemSelectionChanged.connect(
+            self.update_matrix_code
+        )
         self.listWidgetMatrices.itemSelectionChanged.connect(self.add_queries)
         self.listWidgetMatrices.itemSelectionChanged.connect(self.reset_tabs)
         self.pushButtonRequestData.clicked.connect(self.fetch_data)
-        self.lineEditSearch.textChanged.connect(self.filter_toc)
+        self.lineEditSearch.textChanged.connect(
+            lambda _text: self._filter_timer.start()
+        )
         self.pushButtonServiceInformation.clicked.connect(
             self.display_service_information
         )
@@ -115,6 +152,9 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         # style
         self.tabWidgetMatrix.setTabEnabled(Tabs.MAP.value, False)
         self.treeWidgetTableOfContents.setHeaderLabel('')
+        # Column widths are computed from a sample of rows instead of
+        # querying the model for every cell of large matrices
+        self.tableViewMatrix.horizontalHeader().setResizeContentsPrecision(50)
         self.add_services()
 
     def _cast_types(self):
@@ -156,36 +196,51 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         self.show()
         self.exec()
 
+    def _load_toc_nodes(self, reply: QNetworkReply) -> list[Node]:
+        return t.cast(list[Node], read_json(reply))
+
+    def _load_leaf_node(self, reply: QNetworkReply) -> LeafNode:
+        leaf_node = t.cast(LeafNode, read_json(reply))
+        self.add_leaf_node_to_list_widget_item(leaf_node)
+        return leaf_node
+
     def fill_table_of_contents(self) -> None:
-        nodes = t.cast(
-            list[Node],
-            json.loads(self.table_of_contents_reply.readAll().data()),
-        )
+        nodes = self._load_toc_nodes(self.table_of_contents_reply)
         if self.treeWidgetTableOfContents.topLevelItemCount():
             self.treeWidgetTableOfContents.clear()
 
+        # The items are created detached and attached to their parents in
+        # batches, so the tree is notified once per parent, not per item
         items: dict[str, QTreeWidgetItem] = {}
+        children: dict[str, list[QTreeWidgetItem]] = {}
         for node in nodes:
-            parent_item = items.get(node['parentCode'], None)
-            item = QTreeWidgetItem(
-                parent_item
-                if parent_item is not None
-                else self.treeWidgetTableOfContents
-            )
+            item = QTreeWidgetItem()
             items[node['context']['code']] = item
+            children.setdefault(node['parentCode'], []).append(item)
             parsed_node_name = parse_node_name(node['context']['name'])
             wrapped_node_name = textwrap.fill(parsed_node_name, width=40)
             item.setData(0, QTreeWidgetItemRole.NODE.value, node)
+            item.setData(
+                0,
+                QTreeWidgetItemRole.NODE_LOWER.value,
+                parsed_node_name.lower(),
+            )
             item.setText(0, parsed_node_name.title())
             item.setToolTip(0, wrapped_node_name.lower())
+
+        top_level_items: list[QTreeWidgetItem] = []
+        for parent_code, child_items in children.items():
+            parent_item = items.get(parent_code, None)
             if parent_item is None:
-                self.treeWidgetTableOfContents.addTopLevelItem(item)
+                top_level_items.extend(child_items)
             else:
-                parent_item.addChild(item)
+                parent_item.addChildren(child_items)
+        with bulk_update(self.treeWidgetTableOfContents):
+            self.treeWidgetTableOfContents.addTopLevelItems(top_level_items)
         self.display_dialog()
 
     def preprocess_url(self, url: str) -> str:
-        lang = self.get_language()
+        lang = self._current_language
         return url if lang == 'ro' else urljoin(url, f'?lang={lang}')
 
     def fetch_table_of_contents(self) -> QNetworkReply:
@@ -203,6 +258,9 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         return self.table_of_contents_reply
 
     def get_language(self) -> Language:
+        return self._current_language
+
+    def _read_language(self) -> Language:
         if self.checkBoxEnglish.checkState() == Qt.CheckState.Checked:
             return 'en'
         elif self.checkBoxRomanian.checkState() == Qt.CheckState.Checked:
@@ -210,26 +268,23 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         raise ValueError('unreachable')
 
     def switch_language_table_of_contents(self):
-        nodes = t.cast(
-            list[Node],
-            json.loads(self.table_of_contents_reply.readAll().data()),
-        )
+        nodes = self._load_toc_nodes(self.table_of_contents_reply)
+        nodes_by_code = {node['context']['code']: node for node in nodes}
 
-        def find_node(item: QTreeWidgetItem) -> Node:
+        items = get_tree_widget_items_r(self.treeWidgetTableOfContents)
+        for item in items:
             item_node = t.cast(
                 Node, item.data(0, QTreeWidgetItemRole.NODE.value)
             )
-            for node in nodes:
-                if node['context']['code'] == item_node['context']['code']:
-                    return node
-            raise Exception('unreachable')
-
-        items = get_tree_widget_items_r(self.treeWidgetTableOfContents)
-        for item in items:
-            node = find_node(item)
+            node = nodes_by_code[item_node['context']['code']]
             parsed_node_name = parse_node_name(node['context']['name'])
             wrapped_node_name = textwrap.fill(parsed_node_name, width=40)
             item.setData(0, QTreeWidgetItemRole.NODE.value, node)
+            item.setData(
+                0,
+                QTreeWidgetItemRole.NODE_LOWER.value,
+                parsed_node_name.lower(),
+            )
             item.setText(0, parsed_node_name.title())
             item.setToolTip(0, wrapped_node_name.lower())
 
@@ -247,18 +302,16 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
             f'Loading matrices for {parse_node_name(node["context"]["name"])}',
         )
 
-        def find_child(context: Context) -> Context:
-            assert 'children' in node
-            for child in node['children']:
-                if child['code'] == context['code']:
-                    return child
-            raise ValueError('unreachable')
-
         def switch_matrices_language():
             assert 'children' in node
+            children_by_code = {
+                child['code']: child for child in node['children']
+            }
             for item in items:
-                context = item.data(QListWidgetItemRole.CONTEXT.value)
-                child = find_child(context)
+                context = t.cast(
+                    Context, item.data(QListWidgetItemRole.CONTEXT.value)
+                )
+                child = children_by_code[context['code']]
                 item.setData(QListWidgetItemRole.CONTEXT.value, child)
                 item.setData(QListWidgetItemRole.PARENT_NODE.value, node)
                 item.setText(
@@ -278,42 +331,46 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
                 )
 
     def handle_changed_language(self):
+        self._current_language = self._read_language()
         language = 'romanian' if self.get_language() == 'ro' else 'english'
         self.disable_gui()
-        loading_dialog, loading_label = start_loading_dialog_loop(
-            self, f'Fetching table of contents in the {language} language.'
+        self._loading_dialog.start_spin(
+            f'Fetching table of contents in the {language} language.'
         )
         reply = self.fetch_table_of_contents()
-        reply.finished.connect(loading_dialog.close)
-        reply.finished.connect(loading_label.requestInterruption)
+        reply.finished.connect(self._loading_dialog.close)
         reply.finished.connect(self.enable_gui)
 
-    def filter_toc(
-        self,
-        search_string: str,
-        tree_widget_item: QTreeWidgetItem | None = None,
-    ) -> None:
+    def filter_toc(self, search_string: str) -> None:
         search_string = search_string.lower()
-        items = get_tree_widget_items(
-            tree_widget_item
-            if tree_widget_item is not None
-            else self.treeWidgetTableOfContents
-        )
+        tree_widget = self.treeWidgetTableOfContents
 
-        for item in items:
-            assert item is not None
-            if item.childCount():
-                self.filter_toc(search_string, item)
-                item.setHidden(
-                    all(item.isHidden() for item in get_tree_widget_items(item))
-                )
-            else:
-                item.setHidden(search_string not in item.text(0).lower())
-        if tree_widget_item is None:
-            if search_string:
-                self.treeWidgetTableOfContents.expandAll()
-            else:
-                self.treeWidgetTableOfContents.collapseAll()
+        # A branch stays visible if at least one of its leaves matches, so
+        # every matching leaf marks itself and its ancestors as visible.
+        visible: set[QTreeWidgetItem] = set()
+        leaves = QTreeWidgetItemIterator(
+            tree_widget, QTreeWidgetItemIterator.IteratorFlag.NoChildren
+        )
+        while (item := leaves.value()) is not None:
+            if search_string in item.data(
+                0, QTreeWidgetItemRole.NODE_LOWER.value
+            ):
+                while item is not None and item not in visible:
+                    visible.add(item)
+                    item = item.parent()
+            leaves += 1
+
+        with bulk_update(tree_widget):
+            items = QTreeWidgetItemIterator(tree_widget)
+            while (item := items.value()) is not None:
+                item.setHidden(item not in visible)
+                items += 1
+            if bool(search_string) != bool(self._last_search):
+                if search_string:
+                    tree_widget.expandAll()
+                else:
+                    tree_widget.collapseAll()
+        self._last_search = search_string
 
     def reset_tabs(self) -> None:
         if self.frameTableOptions.children():
@@ -335,7 +392,7 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
             return None
 
         if self.listWidgetMatrices.selectedItems():
-            delete_layout_items(t.cast(QLayout, self.frameQuery.layout()))
+            self.clear_query()
         if self.listWidgetMatrices.count():
             with QSignalBlocker(self.listWidgetMatrices):
                 self.listWidgetMatrices.clear()
@@ -353,25 +410,33 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
 
         def add_items():
             assert 'children' in node
-            for child in node['children']:
-                if child['childrenUrl'] != 'matrix':
-                    continue
-                item = QListWidgetItem(self.listWidgetMatrices)
-                item.setData(QListWidgetItemRole.CONTEXT.value, child)
-                item.setData(QListWidgetItemRole.PARENT_NODE.value, node)
-                item.setText(
-                    f'[{child["code"]}] {parse_node_name(child["name"])}'
-                )
-                self.listWidgetMatrices.addItem(item)
+            with bulk_update(self.listWidgetMatrices):
+                for child in node['children']:
+                    if child['childrenUrl'] != 'matrix':
+                        continue
+                    item = QListWidgetItem(self.listWidgetMatrices)
+                    item.setData(QListWidgetItemRole.CONTEXT.value, child)
+                    item.setData(QListWidgetItemRole.PARENT_NODE.value, node)
+                    item.setText(
+                        f'[{child["code"]}] {parse_node_name(child["name"])}'
+                    )
+                    self.listWidgetMatrices.addItem(item)
 
         reply.finished.connect(add_items)
 
-    def get_matrix_code(self) -> str | None:
+    def update_matrix_code(self) -> None:
         selected_items = self.listWidgetMatrices.selectedItems()
-        assert selected_items
-        return t.cast(
-            Context, selected_items[0].data(QListWidgetItemRole.CONTEXT.value)
-        )['code']
+        self._current_matrix_code = (
+            t.cast(
+                Context,
+                selected_items[0].data(QListWidgetItemRole.CONTEXT.value),
+            )['code']
+            if selected_items
+            else None
+        )
+
+    def get_matrix_code(self) -> str | None:
+        return self._current_matrix_code
 
     def get_leaf_node(self) -> QNetworkReply | None:
         dataset_code = self.get_matrix_code()
@@ -393,42 +458,32 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         reply = self.get_leaf_node()
         assert reply is not None
 
-        def find_dimension(
-            dimensions: list[Dimension], dimension_code: int
-        ) -> Dimension:
-            for dimension in dimensions:
-                if dimension['dimCode'] == dimension_code:
-                    return dimension
-            raise ValueError('unreachable')
-
-        def find_choice(choices: list[Choice], nom_item_id: int) -> Choice:
-            for choice in choices:
-                if choice['nomItemId'] == nom_item_id:
-                    return choice
-            raise ValueError('unreachable')
-
         def switch_language():
-            leaf_node = t.cast(LeafNode, json.loads(reply.readAll().data()))
-            self.add_leaf_node_to_list_widget_item(leaf_node)
-            layouts = get_children(self.frameQuery.layout(), QVBoxLayout)
-            for layout in layouts:
-                list_widget = get_widgets(layout, QListWidgetAlwaysSelected)[0]
-                label = get_widgets(layout, QLabel)[0]
-                dimension = find_dimension(
-                    leaf_node['dimensionsMap'],
+            leaf_node = self._load_leaf_node(reply)
+            dimensions_by_code = {
+                dimension['dimCode']: dimension
+                for dimension in leaf_node['dimensionsMap']
+            }
+            for label, list_widget in zip(
+                self._query_labels, self._query_list_widgets
+            ):
+                dimension = dimensions_by_code[
                     t.cast(
                         Dimension,
-                        layout.property(WidgetProperty.DIMENSION.value),
-                    )['dimCode'],
-                )
+                        list_widget.property(WidgetProperty.DIMENSION.value),
+                    )['dimCode']
+                ]
+                choices_by_id = {
+                    choice['nomItemId']: choice
+                    for choice in dimension['options']
+                }
                 label.setText(fix_trailing_whitespace(dimension['label']))
                 for item in get_list_widget_items(list_widget):
-                    choice = find_choice(
-                        dimension['options'],
+                    choice = choices_by_id[
                         t.cast(
                             Choice, item.data(QListWidgetItemRole.CHOICE.value)
-                        )['nomItemId'],
-                    )
+                        )['nomItemId']
+                    ]
                     item.setData(QListWidgetItemRole.CHOICE.value, choice)
                     item.setText(fix_trailing_whitespace(choice['label']))
                     item.setToolTip(item.text())
@@ -453,8 +508,7 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
 
         def add_dimensions() -> None:
             assert reply is not None
-            leaf_node = t.cast(LeafNode, json.loads(reply.readAll().data()))
-            self.add_leaf_node_to_list_widget_item(leaf_node)
+            leaf_node = self._load_leaf_node(reply)
             if leaf_node is not None:
                 self.add_dimensions_to_frame_query(leaf_node['dimensionsMap'])
 
@@ -467,78 +521,100 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
             return None
 
     def set_query_children_hidden(self) -> None:
-        parent_widget = t.cast(QListWidget, self.sender())
-        frame_children = get_children(self.frameQuery, QListWidget)
-        child_widget = frame_children[frame_children.index(parent_widget) + 1]
-        selected_parent_choices = []
-        for item in parent_widget.selectedItems():
-            selected_parent_choices.append(
-                t.cast(Choice, item.data(QListWidgetItemRole.CHOICE.value))[
-                    'nomItemId'
-                ]
-            )
-        for item in get_list_widget_items(child_widget):
-            if item is None:
-                continue
-            choice = t.cast(Choice, item.data(QListWidgetItemRole.CHOICE.value))
-            bool_ = choice['parentId'] in selected_parent_choices
-            item.setHidden(not bool_)
-            if bool_ is False and item.isSelected():
-                item.setSelected(False)
+        parent_widget = t.cast(QListWidgetAlwaysSelected, self.sender())
+        index = self._query_list_widgets.index(parent_widget) + 1
+        child_widget = self._query_list_widgets[index]
+        items_by_parent = self._query_items_by_parent[index]
+        selected_parent_choices = {
+            t.cast(Choice, item.data(QListWidgetItemRole.CHOICE.value))[
+                'nomItemId'
+            ]
+            for item in parent_widget.selectedItems()
+        }
+        visible_parents = self._query_visible_parents[index]
+        # Only the items whose parent changed its selection state are touched
+        with updates_disabled(child_widget):
+            for parent_id in visible_parents - selected_parent_choices:
+                for item in items_by_parent.get(parent_id, ()):
+                    item.setHidden(True)
+            for parent_id in selected_parent_choices - visible_parents:
+                for item in items_by_parent.get(parent_id, ()):
+                    item.setHidden(False)
+            # Also catches rows hidden since population, like the first row
+            for item in child_widget.selectedItems():
+                if item.isHidden():
+                    item.setSelected(False)
+        self._query_visible_parents[index] = selected_parent_choices
+
+    def clear_query(self) -> None:
+        delete_layout_items(self.frameQuery.layout())
+        self._query_labels.clear()
+        self._query_list_widgets.clear()
+        self._query_items_by_parent.clear()
+        self._query_visible_parents.clear()
 
     def add_dimensions_to_frame_query(
         self, dimensions: c.Iterable[Dimension]
     ) -> None:
         layout = self.frameQuery.layout()
         if layout is not None:
-            delete_layout_items(layout)
+            self.clear_query()
         else:
             layout = QHBoxLayout(self.frameQuery)
             self.frameQuery.setLayout(layout)
-        for i, dimension in enumerate(dimensions):
-            layout = QVBoxLayout()
-            layout.setProperty(WidgetProperty.DIMENSION.value, dimension)
-            label = QLabel(
-                text=fix_trailing_whitespace(dimension['label']),
-                parent=self.frameQuery,
-            )
-            list_widget = QListWidgetAlwaysSelected(self.frameQuery)
+        # Signals stay connected, QListWidgetAlwaysSelected and the
+        # parent/child dimension wiring rely on them while populating
+        with updates_disabled(self.frameQuery):
+            for i, dimension in enumerate(dimensions):
+                layout = QVBoxLayout()
+                label = QLabel(
+                    text=fix_trailing_whitespace(dimension['label']),
+                    parent=self.frameQuery,
+                )
+                list_widget = QListWidgetAlwaysSelected(self.frameQuery)
+                list_widget.setProperty(
+                    WidgetProperty.DIMENSION.value, dimension
+                )
+                self._query_labels.append(label)
+                self._query_list_widgets.append(list_widget)
 
-            layout.addWidget(label)
-            layout.addWidget(list_widget)
-            t.cast(QHBoxLayout, self.frameQuery.layout()).addLayout(layout)
-            has_parent = False
-            for choice in dimension['options']:
-                item = QListWidgetItem(list_widget)
-                item.setData(QListWidgetItemRole.CHOICE.value, choice)
-                item.setText(fix_trailing_whitespace(choice['label']))
-                if choice['parentId'] is not None:
-                    item.setHidden(True)
-                    has_parent = True
-                item.setToolTip(item.text())
-            if has_parent:
-                # If it has a parent, the parent is always the previous dimension
-                get_children(self.frameQuery, QListWidget)[
-                    -2
-                ].itemSelectionChanged.connect(self.set_query_children_hidden)
+                layout.addWidget(label)
+                layout.addWidget(list_widget)
+                t.cast(QHBoxLayout, self.frameQuery.layout()).addLayout(layout)
                 has_parent = False
-            list_widget.setMinimumWidth(list_widget.width() + 5)
+                items_by_parent: dict[int | None, list[QListWidgetItem]] = {}
+                for choice in dimension['options']:
+                    item = QListWidgetItem(list_widget)
+                    item.setData(QListWidgetItemRole.CHOICE.value, choice)
+                    item.setText(fix_trailing_whitespace(choice['label']))
+                    if choice['parentId'] is not None:
+                        item.setHidden(True)
+                        has_parent = True
+                    item.setToolTip(item.text())
+                    items_by_parent.setdefault(choice['parentId'], []).append(
+                        item
+                    )
+                self._query_items_by_parent.append(items_by_parent)
+                self._query_visible_parents.append(
+                    {None} if None in items_by_parent else set()
+                )
+                if has_parent:
+                    # If it has a parent, the parent is always the previous dimension
+                    self._query_list_widgets[-2].itemSelectionChanged.connect(
+                        self.set_query_children_hidden
+                    )
+                    has_parent = False
+                list_widget.setMinimumWidth(list_widget.width() + 5)
 
     def construct_query(self) -> str:
-        list_widgets = get_children(self.frameQuery, QListWidget)
-        query: list[str] = []
-        for list_widget in list_widgets:
-            choices = t.cast(
-                list[Choice],
-                [
-                    selected_item.data(QListWidgetItemRole.CHOICE.value)
-                    for selected_item in list_widget.selectedItems()
-                ],
-            )
-            query.append(
-                ','.join([str(choice['nomItemId']) for choice in choices])
+        role = QListWidgetItemRole.CHOICE.value
+        return ':'.join(
+            ','.join(
+                str(item.data(role)['nomItemId'])
+                for item in list_widget.selectedItems()
             )
-        return ':'.join(query)
+            for list_widget in self._query_list_widgets
+        )
 
     def construct_body(self) -> RequestBody | None:
         current_item = self.listWidgetMatrices.currentItem()
@@ -571,7 +647,7 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
                 ]
             )
         self.comboBoxGroupByField.setCurrentIndex(0)
-        self.comboBoxGroupByField.currentIndexChanged.emit(0)
+        self.add_table_options()
 
     def get_model_matrix(self) -> Matrix | None:
         model = self.tableViewMatrix.model()
@@ -584,13 +660,17 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         self.pushButtonAddVectorLayer.setEnabled(True)
         assert matrix is not None
         group_by_field = self.comboBoxGroupByField.currentText()
+        if group_by_field == self._last_group_by:
+            return None
+        self._last_group_by = group_by_field
         layout = self.frameTableOptions.layout()
         if layout is not None:
             delete_layout_items(layout)
+            self._table_option_combos.clear()
         else:
             layout = QVBoxLayout(self.frameTableOptions)
             self.frameTableOptions.setLayout(layout)
-        for field_, values in matrix.items():
+        for field_ in matrix.fields:
             if (
                 field_.is_geo
                 or field_.is_value
@@ -602,8 +682,9 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
             )
             combo_box = QComboBox(self.frameTableOptions)
             add_completer_to_combo_box(combo_box)
-            combo_box.addItems(sorted(set(values)))
+            combo_box.addItems(matrix.unique_values(field_))
             combo_box.setProperty(WidgetProperty.FIELD.value, field_)
+            self._table_option_combos.append(combo_box)
             if combo_box.count() == 1:
                 combo_box.setCurrentIndex(0)
             layout.addWidget(label)
@@ -633,25 +714,34 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
             f'Fetching data for {self.get_matrix_code()}',
         )
 
-        def set_matrix():
-            current_item = self.listWidgetMatrices.currentItem()
-            assert current_item
-            current_item.setData(
-                QListWidgetItemRole.MATRIX.value,
-                Matrix.from_response(reply.readAll().data(), body),
-            )
+        reply.finished.connect(partial(self._on_fetch_finished, reply, body))
+        return reply
 
-        reply.finished.connect(set_matrix)
-        reply.finished.connect(self.handle_map_tab)
-        reply.finished.connect(self.update_table)
-        reply.finished.connect(
-            lambda: self.pushButtonAddTableLayer.setEnabled(True)
+    def _on_fetch_finished(self, reply: QNetworkReply, body: RequestBody):
+        # Parsing large responses would block the event loop, so it is
+        # done on a pooled thread and the result is handed to set_matrix.
+        self._matrix_parser = MatrixParser(reply.readAll().data(), body)
+        self._matrix_parser.signals.matrix_ready.connect(self.set_matrix)
+        self._matrix_parser.signals.error_ocurred.connect(self.enable_gui)
+        self._matrix_parser.signals.error_ocurred.connect(
+            self.qtempo._handle_error_signal
         )
-        reply.finished.connect(self.enable_gui)
-        return reply
+        self._thread_pool.start(self._matrix_parser)
+
+    def set_matrix(self, matrix: Matrix) -> None:
+        current_item = self.listWidgetMatrices.currentItem()
+        assert current_item
+        with updates_disabled(self):
+            current_item.setData(QListWidgetItemRole.MATRIX.value, matrix)
+            self.handle_map_tab()
+            self.update_table()
+            self.pushButtonAddTableLayer.setEnabled(True)
+            self.enable_gui()
 
     def clear_table_options(self) -> None:
         delete_layout_items(self.frameTableOptions.layout())
+        self._table_option_combos.clear()
+        self._last_group_by = None
         with QSignalBlocker(self.comboBoxGroupByField):
             self.comboBoxGroupByField.clear()
 
@@ -695,13 +785,7 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
     def add_services(self) -> None:
         self.mGroupBoxServices.setLayout(QVBoxLayout())
 
-        for service in services.__dict__.values():
-            if (
-                service is services.Service
-                or not isinstance(service, type)
-                or not issubclass(service, services.Service)
-            ):
-                continue
+        for service in services.SERVICES:
             item = QListWidgetItem(self.listWidgetServices)
             # NOTE: look more into this, mypy error
             class_ = service()  # type: ignore
@@ -712,22 +796,13 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
                 item.setSelected(True)
 
     def get_table_options(self) -> dict[Field, str]:
-        options_combo_boxes = get_children(self.frameTableOptions, QComboBox)
         return {
             combo_box.property(
                 WidgetProperty.FIELD.value
             ): combo_box.currentText()
-            for combo_box in options_combo_boxes
+            for combo_box in self._table_option_combos
         }
 
-    def get_grouped_matrix(self) -> Matrix:
-        matrix = self.get_model_matrix()
-        group_by_field = self.comboBoxGroupByField.currentText()
-        assert matrix is not None
-        return matrix.group_by(
-            matrix.fields.get(group_by_field), self.get_table_options()
-        )
-
     def get_siruta_field_name(self) -> str:
         return 'SIRUTA'
 
@@ -735,19 +810,16 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         # NOTE: This function throws the a warning:
         # Warning: QObject::setParent: Cannot set parent
         # It is related to the
-        handler = ServiceHandler(self)
-        assert handler.service is not None
+        self._service_handler = handler = ServiceHandler(self)
 
         self.disable_gui()
-        loading_dialog, loading_label = start_loading_dialog_loop(
-            self,
-            f'Fetching data from service {handler.service.short_name}',
+        self._loading_dialog.start_spin(
+            f'Fetching data from service {handler.service.short_name}'
         )
-        handler.error_ocurred.connect(self.qtempo._handle_error_signal)
-        handler.finished.connect(loading_dialog.close)
-        handler.finished.connect(loading_label.requestInterruption)
-        handler.finished.connect(self.enable_gui)
-        handler.start()
+        handler.signals.error_ocurred.connect(self.qtempo._handle_error_signal)
+        handler.signals.finished.connect(self._loading_dialog.close)
+        handler.signals.finished.connect(self.enable_gui)
+        self._thread_pool.start(handler)
 
     def add_table_layer(self) -> None:
         model = self.get_model_matrix()
@@ -767,9 +839,8 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         )
 
     def set_gui_state(self, state: bool) -> None:
-        for obj in self.children():
-            if isinstance(obj, QWidget):
-                obj.setEnabled(state)
+        for widget in self._toggleable:
+            widget.setEnabled(state)
 
     def enable_gui(self) -> None:
         self.set_gui_state(True)
@@ -778,25 +849,37 @@ class Dialog(QDialog, UI_Dialog):  # type: ignore
         self.set_gui_state(False)
 
 
-class ServiceHandler(QThread):
+class ServiceHandlerSignals(QObject):
     error_ocurred = pyqtSignal(Exception)
+    finished = pyqtSignal()
+
 
+class ServiceHandler(QRunnable):
     def __init__(self, dialog: Dialog):
-        super().__init__(dialog)
+        super().__init__()
         self.dialog = dialog
-        self.service = self.dialog.get_selected_service()
-        assert self.service is not None
+        service = self.dialog.get_selected_service()
+        assert service is not None
+        self.service = service
+        # Everything read from the widgets is captured here, on the GUI
+        # thread, the worker only uses these values
+        matrix = self.dialog.get_model_matrix()
+        assert matrix is not None
+        self.matrix = matrix
+        self.group_by = matrix.fields.get(
+            self.dialog.comboBoxGroupByField.currentText()
+        )
+        self.table_options = self.dialog.get_table_options()
+        self.matrix_code = self.dialog.get_matrix_code()
+        self.siruta_field_name = self.dialog.get_siruta_field_name()
+        self.signals = ServiceHandlerSignals()
 
     def _run(self):
-        grouped_matrix = self.dialog.get_grouped_matrix()
+        grouped_matrix = self.matrix.group_by(self.group_by, self.table_options)
         matrix = grouped_matrix.as_table(
-            self.dialog.get_matrix_code(), self.dialog.get_siruta_field_name()
+            self.matrix_code, self.siruta_field_name
         )
         assert grouped_matrix.siruta is not None
-        assert self.service is not None
-
-        assert self.service is not None
-
         service_layer = self.service.get_layer(
             [siruta for siruta in grouped_matrix.siruta if siruta is not None]
         )
@@ -808,7 +891,7 @@ class ServiceHandler(QThread):
                     'INPUT': service_layer,
                     'FIELD': self.service.siruta_field,
                     'INPUT_2': matrix,
-                    'FIELD_2': self.dialog.get_siruta_field_name(),
+                    'FIELD_2': self.siruta_field_name,
                     'FIELDS_TO_COPY': [],
                     'METHOD': 1,
                     'DISCARD_NONMATCHING': True,
@@ -819,7 +902,7 @@ class ServiceHandler(QThread):
         )
 
         processing_result.setName(
-            f'{self.service.short_name} [{self.dialog.get_matrix_code()}]'
+            f'{self.service.short_name} [{self.matrix_code}]'
         )
         instance = QgsProject().instance()
         if instance is not None:
@@ -829,30 +912,56 @@ class ServiceHandler(QThread):
             canvas.setExtent(processing_result.extent())
 
     def run(self):
-        assert self.service
         try:
             self._run()
         except Exception as e:
-            self.error_ocurred.emit(e)
+            self.signals.error_ocurred.emit(e)
+        finally:
+            self.signals.finished.emit()
+
+
+class MatrixParserSignals(QObject):
+    matrix_ready = pyqtSignal(object)
+    error_ocurred = pyqtSignal(Exception)
+
+
+class MatrixParser(QRunnable):
+    def __init__(self, response: bytes, request_body: RequestBody):
+        super().__init__()
+        self.response = response
+        self.request_body = request_body
+        self.signals = MatrixParserSignals()
+
+    def run(self):
+        try:
+            matrix = Matrix.from_response(self.response, self.request_body)
+        except Exception as e:
+            self.signals.error_ocurred.emit(e)
+        else:
+            self.signals.matrix_ready.emit(matrix)
 
 
 class MatrixModel(QAbstractTableModel):
     def __init__(self, matrix: Matrix, parent: QObject | None = None):
         super().__init__(parent)
         self._matrix = matrix
+        # Resolved once, data() and headerData() run for every painted cell
+        self._columns = matrix.columns
+        self._row_count = matrix.row_count
+        self._headers = [field_.name for field_ in matrix.fields]
 
     def rowCount(self, parent: QModelIndex | None = None) -> int:
-        return len(self._matrix.data)
+        return self._row_count
 
     def columnCount(self, parent: QModelIndex | None = None) -> int:
-        return len(self._matrix.fields)
+        return len(self._headers)
 
     def data(
         self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole
     ) -> t.Any | None:
-        if index.isValid():
-            if role == Qt.ItemDataRole.DisplayRole:
-                return self._matrix.data[index.row()][index.column()]
+        # Most calls are for other roles, so the role is checked first
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._columns[index.column()][index.row()]
         return None
 
     def headerData(
@@ -862,68 +971,52 @@ class MatrixModel(QAbstractTableModel):
             orientation == Qt.Orientation.Horizontal
             and role == Qt.ItemDataRole.DisplayRole
         ):
-            return self._matrix.fields[section].name
+            return self._headers[section]
         return None
 
 
-class LoadingLabel(QThread):
-    update_label = pyqtSignal(str)
-
-    def __init__(self, label: str, base: QWidget | None = None):
-        self.base = base
-        super().__init__(self.base)
-        self.label = label
-
-    def spin(self) -> None:
-        for char in itertools.cycle('🌏🌍🌎'):
-            self.update_label.emit(f'{self.label}\n{char}  ')
-            time.sleep(0.5)
-            if self.isInterruptionRequested():
-                break
-
-    def run(self) -> None:
-        self.spin()
-
-
-def start_loading_dialog_loop(
-    parent: QWidget, text: str
-) -> tuple[LoadingDialog, LoadingLabel]:
-    loading_dialog = LoadingDialog(parent)
-    loading_label = LoadingLabel(text)
-    loading_label.update_label.connect(loading_dialog.update_loading_label)
-    loading_label.start()
-    loading_dialog.show()
-    return (loading_dialog, loading_label)
-
-
 @dataclass
 class RequestHandler:
     manager: QgsNetworkAccessManager
     parent: Dialog
-    loading_label: LoadingLabel = field(init=False)
     loading_dialog: LoadingDialog = field(init=False)
+    _pending: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        # The same dialog is shown for every request made by this handler
+        self.loading_dialog = LoadingDialog(self.parent)
 
     def show_dialog(self, text: str):
-        self.loading_dialog, self.loading_label = start_loading_dialog_loop(
-            self.parent, text
-        )
+        self._pending += 1
+        self.loading_dialog.start_spin(text)
 
     def post(
         self, request: QNetworkRequest, data: bytes, text: str
     ) -> QNetworkReply:
         self.show_dialog(text)
         reply = self.manager.post(request, data)
-        reply.finished.connect(self.close_dialog)
+        self._close_dialog_on_finished(reply)
         return reply
 
     def get(self, request: QNetworkRequest, text: str) -> QNetworkReply:
         self.show_dialog(text)
         reply = self.manager.get(request)
-        reply.finished.connect(self.close_dialog)
+        self._close_dialog_on_finished(reply)
         return reply
 
+    def _close_dialog_on_finished(self, reply: QNetworkReply) -> None:
+        # One-shot connection, the slot drops itself once it fired so a
+        # pending request is only ever counted down once
+        def on_finished():
+            reply.finished.disconnect(on_finished)
+            self.close_dialog()
+
+        reply.finished.connect(on_finished)
+
     def close_dialog(self) -> None:
-        self.loading_label.requestInterruption()
+        self._pending -= 1
+        if self._pending:
+            return None
         self.loading_dialog.close()
 
 
@@ -965,7 +1058,7 @@ class QTempo:
     def run(self) -> None:
         if self.first_start is True:
             self.first_start = False
-            self.network_manager = QgsNetworkAccessManager()
+            self.network_manager = QgsNetworkAccessManager.instance()
             self.dialog = Dialog(self)
             main_window = self.iface.mainWindow()
             assert main_window
@@ -2,4 +2,6 @@ from .abc import Service
 from .ancpi import ANCPI
 from .gisco import GISCOLAU, GISCOCommunes
 
-__all__ = ['Service', 'GISCOLAU', 'GISCOCommunes', 'ANCPI']
+SERVICES: tuple[type[Service], ...] = (ANCPI, GISCOLAU, GISCOCommunes)
+
+__all__ = ['Service', 'GISCOLAU', 'GISCOCommunes', 'ANCPI', 'SERVICES']
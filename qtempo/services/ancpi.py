@@ -5,15 +5,17 @@ import typing as t
 from urllib.parse import urlencode
 
 from qgis.core import (
+    QgsFeature,
+    QgsFeatureSink,
+    QgsFields,
     QgsJsonUtils,
     QgsNetworkAccessManager,
     QgsVectorLayer,
-    edit,
 )
 from qgis.PyQt.QtCore import (
     QUrl,
 )
-from qgis.PyQt.QtNetwork import QNetworkRequest
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
 
 from ..exceptions import ServiceError
 from .abc import Service
@@ -25,6 +27,8 @@ if t.TYPE_CHECKING:
 
 
 class ANCPI(Service):
+    max_codes_per_request = 200
+
     @property
     def full_name(self) -> str:
         return 'Agenția Națională de Cadastru și Publicitate Imobiliară (ANCPI)'
@@ -45,42 +49,60 @@ class ANCPI(Service):
     def is_default(self) -> bool:
         return False
 
-    def handle_reply(self, reply: QgsNetworkReplyContent) -> QgsVectorLayer:
-        geojson = reply.content().data().decode(encoding='UTF-8')
-        layer = QgsVectorLayer('MultiPolygon', self.short_name, 'memory')
-        fields = QgsJsonUtils.stringToFields(geojson)
-        features = QgsJsonUtils.stringToFeatureList(geojson, fields)
+    def handle_replies(
+        self, replies: c.Iterable[QgsNetworkReplyContent]
+    ) -> QgsVectorLayer:
+        fields: QgsFields | None = None
+        features: list[QgsFeature] = []
+        for reply in replies:
+            if reply.error() != QNetworkReply.NetworkError.NoError:
+                raise ServiceError(
+                    f'Failed to fetch data from {self.short_name}. {reply.errorString()}'
+                )
+            geojson = reply.content().data().decode(encoding='UTF-8')
+            reply_fields = QgsJsonUtils.stringToFields(geojson)
+            if not reply_fields.count():
+                continue
+            if fields is None:
+                fields = reply_fields
+            features.extend(QgsJsonUtils.stringToFeatureList(geojson, fields))
         if not features:
             raise ServiceError(
                 f'Failed to fetch data from {self.short_name}. No features were returned. Try again later.'
             )
-        if all(field_.name() != self.siruta_field for field_ in fields):
+        assert fields is not None
+        if fields.indexOf(self.siruta_field) == -1:
             raise ServiceError(
                 f'Failed to fetch data from {self.short_name}. The SIRUTA field {self.siruta_field!r} was not found.'
             )
+        layer = QgsVectorLayer('MultiPolygon', self.short_name, 'memory')
         provider = layer.dataProvider()
         assert provider is not None
         provider.addAttributes(fields)
         layer.updateFields()
-        with edit(layer):
-            layer.addFeatures(features)
+        provider.addFeatures(features, QgsFeatureSink.Flag.FastInsert)
+        layer.updateExtents()
         return layer
 
     def get_layer(self, siruta: list[SIRUTA]) -> QgsVectorLayer:
-        return self.handle_reply(
-            self.request_data(self.construct_request_data(siruta))
+        # Long IN lists are split over several requests to keep each
+        # request body small
+        size = self.max_codes_per_request
+        return self.handle_replies(
+            self.request_data(self.construct_request_data(siruta[i : i + size]))
+            for i in range(0, len(siruta), size)
         )
 
     def construct_request_data(self, siruta: c.Sequence[SIRUTA]) -> bytes:
-        if len(siruta) == 1:
-            where = f"{self.siruta_field} = '{siruta[0].code}'"
-        else:
-            where = f'{self.siruta_field} in {tuple(value.code for value in siruta)}'
+        codes = ', '.join(
+            "'{}'".format(value.code.replace("'", "''")) for value in siruta
+        )
         return urlencode(
             {
                 'f': 'geojson',
-                'where': where,
+                'where': f'{self.siruta_field} IN ({codes})',
                 'outFields': f'{self.siruta_field},name',
+                'returnGeometry': 'true',
             }
         ).encode(encoding='UTF-8')
 
@@ -90,5 +112,5 @@ class ANCPI(Service):
             QNetworkRequest.KnownHeaders.ContentTypeHeader,
             'application/x-www-form-urlencoded',
         )
-        manager = QgsNetworkAccessManager()
+        manager = QgsNetworkAccessManager.instance()
         return manager.blockingPost(request, data=data)
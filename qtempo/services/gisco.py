@@ -1,22 +1,28 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import json
+import re
 import typing as t
-from functools import cache
+from contextlib import suppress
+from functools import cached_property
+from pathlib import Path
 from urllib.parse import urljoin
 
 from qgis.core import (
     QgsFeature,
+    QgsFeatureSink,
+    QgsFields,
     QgsJsonUtils,
     QgsNetworkAccessManager,
     QgsVectorLayer,
-    edit,
 )
 from qgis.PyQt.QtCore import (
+    QStandardPaths,
     QUrl,
 )
-from qgis.PyQt.QtNetwork import QNetworkRequest
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
 
 from .._typing import GISCO as GISCO_T
 from ..exceptions import ServiceError
@@ -27,9 +33,21 @@ if t.TYPE_CHECKING:
 
 
 def request(url: str) -> bytes:
-    network = QgsNetworkAccessManager()
+    # The manager of the calling thread is reused, so the sequential
+    # requests to the same host share its connections
+    network = QgsNetworkAccessManager.instance()
     request = QNetworkRequest(QUrl(url))
-    return network.blockingGet(request).content().data()
+    reply = network.blockingGet(request)
+    if reply.error() != QNetworkReply.NetworkError.NoError:
+        raise ServiceError(f'Failed to fetch {url!r}: {reply.errorString()}')
+    return reply.content().data()
+
+
+def get_cache_dir() -> Path:
+    location = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.AppDataLocation
+    )
+    return Path(location) / 'qtempo' / 'gisco'
 
 
 def request_datasets(url: str) -> dict[str, GISCO_T.DatasetDetails]:
@@ -48,25 +66,105 @@ def request_dataset_files(
     )
 
 
-@cache
-def get_most_recent_dataset(url: str) -> str:
+def select_geojson_file(files: dict[str, str], country: str) -> str:
+    # Prefer a file scoped to the country, e.g. LAU_RG_01M_2021_RO_4326,
+    # over the pan-European one, so far less data is downloaded and parsed
+    country_keys = [
+        key for key in files if country in re.split(r'[_.]', key.upper())
+    ]
+    # we select the last key of the files
+    # this corresponds to the 4326 CRS dataset
+    return files[(country_keys or list(files))[-1]]
+
+
+def get_most_recent_dataset(url: str, country: str = 'RO') -> str:
     datasets = request_datasets(url)
 
     def sort_by_date(details: GISCO_T.DatasetDetails):
         return datetime.datetime.strptime(details['date'], '%d/%m/%Y')
 
     details = sorted(datasets.values(), key=sort_by_date)[-1]
+    # The downloaded file is kept on disk between sessions, keyed by the
+    # release date, so it is only fetched again for a newer release
+    prefix = f'{hashlib.sha1(url.encode()).hexdigest()[:12]}_{country}'
+    cache_dir = get_cache_dir()
+    date = sort_by_date(details).strftime('%Y%m%d')
+    cached_file = cache_dir / f'{prefix}_{date}.geojson'
+    # A missing or unreadable cache file falls back to a fresh download
+    with suppress(OSError, UnicodeDecodeError):
+        return cached_file.read_text(encoding='UTF-8')
     files = request_dataset_files(url, details)
-    dataset_geojson_files = files['geojson']
-    # we select the last key of the files
-    # this corresponds to the 4326 CRS dataset
-    key = list(dataset_geojson_files)[-1]
-    return request(urljoin(url, dataset_geojson_files[key])).decode(
-        encoding='UTF-8'
-    )
+    geojson_file = select_geojson_file(files['geojson'], country)
+    content = request(urljoin(url, geojson_file))
+    with suppress(OSError):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Outdated releases and leftover partial downloads
+        for outdated_file in cache_dir.glob(f'{prefix}_*'):
+            outdated_file.unlink()
+        partial_file = cached_file.with_suffix('.part')
+        partial_file.write_bytes(content)
+        partial_file.replace(cached_file)
+    return content.decode(encoding='UTF-8')
+
+
+def get_parsed_dataset(
+    url: str, country: str = 'RO'
+) -> tuple[QgsFields, list[QgsFeature]]:
+    geojson = get_most_recent_dataset(url, country)
+    fields = QgsJsonUtils.stringToFields(geojson)
+    return (fields, QgsJsonUtils.stringToFeatureList(geojson, fields))
+
+
+class GISCO(Service):
+    def process_siruta_value(self, siruta: str) -> str:
+        return siruta
+
+    @cached_property
+    def _dataset(self) -> tuple[QgsFields, dict[str, list[QgsFeature]]]:
+        # Only the fields and the RO features, indexed by SIRUTA code, are
+        # kept for the session. Every later layer is assembled from
+        # lookups, and the other parsed features are freed once indexed.
+        fields, features = get_parsed_dataset(self.url)
+        siruta_index = fields.indexOf(self.siruta_field)
+        country_index = fields.indexOf('CNTR_CODE')
+        if siruta_index == -1:
+            raise ServiceError(
+                f'Failed to fetch data from {self.short_name}. The SIRUTA field {self.siruta_field!r} was not found.'
+            )
+        if not features:
+            raise ServiceError(
+                f'Failed to fetch data from {self.short_name}. No features were returned. Try again later.'
+            )
+        features_by_code: dict[str, list[QgsFeature]] = {}
+        for feature in features:
+            # Still needed when only the pan-European file is available, a
+            # file without the country field is taken as already scoped
+            if country_index != -1 and feature[country_index] != 'RO':
+                continue
+            code = self.process_siruta_value(feature[siruta_index])
+            feature.setAttribute(siruta_index, code)
+            features_by_code.setdefault(code, []).append(feature)
+        return (fields, features_by_code)
 
+    def get_layer(self, siruta: list[SIRUTA]) -> QgsVectorLayer:
+        fields, features_by_code = self._dataset
+        siruta_codes = {value.code for value in siruta}
+        kept_features = [
+            feature
+            for code in siruta_codes
+            for feature in features_by_code.get(code, ())
+        ]
+        layer = QgsVectorLayer('MultiPolygon', self.short_name, 'memory')
+        provider = layer.dataProvider()
+        assert provider is not None
+        provider.addAttributes(fields)
+        layer.updateFields()
+        provider.addFeatures(kept_features, QgsFeatureSink.Flag.FastInsert)
+        layer.updateExtents()
+        return layer
 
-class GISCOLAU(Service):
+
+class GISCOLAU(GISCO):
     @property
     def full_name(self) -> str:
         return (
@@ -91,44 +189,10 @@ class GISCOLAU(Service):
 
     def process_siruta_value(self, siruta: str) -> str:
         # Schema, as of 22 july 2025, is RO_98505
-        return siruta.split('_')[-1]
-
-    def get_layer(self, siruta: list[SIRUTA]) -> QgsVectorLayer:
-        siruta_codes = [value.code for value in siruta]
+        return siruta.rpartition('_')[2]
 
-        def keep_feature(feature: QgsFeature) -> bool:
-            return (
-                feature.attribute(self.siruta_field) in siruta_codes
-                and feature.attribute('CNTR_CODE') == 'RO'
-            )
 
-        geojson = get_most_recent_dataset(self.url)
-        layer = QgsVectorLayer('MultiPolygon', self.short_name, 'memory')
-        fields = QgsJsonUtils.stringToFields(geojson)
-        if all(field_.name() != self.siruta_field for field_ in fields):
-            raise ServiceError(
-                f'Failed to fetch data from {self.short_name}. The SIRUTA field {self.siruta_field!r} was not found.'
-            )
-        features = QgsJsonUtils.stringToFeatureList(geojson, fields)
-        for feature in features:
-            feature.setAttribute(
-                self.siruta_field,
-                self.process_siruta_value(feature.attribute(self.siruta_field)),
-            )
-        if not features:
-            raise ServiceError(
-                f'Failed to fetch data from {self.short_name}. No features were returned. Try again later.'
-            )
-        provider = layer.dataProvider()
-        assert provider is not None
-        provider.addAttributes(fields)
-        layer.updateFields()
-        with edit(layer):
-            layer.addFeatures(filter(keep_feature, features))
-        return layer
-
-
-class GISCOCommunes(Service):
+class GISCOCommunes(GISCO):
     @property
     def full_name(self) -> str:
         return (
@@ -150,37 +214,3 @@ class GISCOCommunes(Service):
     @property
     def is_default(self) -> bool:
         return False
-
-    def get_layer(self, siruta: list[SIRUTA]) -> QgsVectorLayer:
-        siruta_codes = [value.code for value in siruta]
-
-        def keep_feature(feature: QgsFeature) -> bool:
-            return (
-                feature.attribute(self.siruta_field) in siruta_codes
-                and feature.attribute('CNTR_CODE') == 'RO'
-            )
-
-        geojson = get_most_recent_dataset(self.url)
-        layer = QgsVectorLayer('MultiPolygon', self.short_name, 'memory')
-        fields = QgsJsonUtils.stringToFields(geojson)
-        if all(field_.name() != self.siruta_field for field_ in fields):
-            raise ServiceError(
-                f'Failed to fetch data from {self.short_name}. The SIRUTA field {self.siruta_field!r} was not found.'
-            )
-        features = QgsJsonUtils.stringToFeatureList(geojson, fields)
-        for feature in features:
-            feature.setAttribute(
-                self.siruta_field,
-                feature.attribute(self.siruta_field),
-            )
-        if not features:
-            raise ServiceError(
-                f'Failed to fetch data from {self.short_name}. No features were returned. Try again later.'
-            )
-        provider = layer.dataProvider()
-        assert provider is not None
-        provider.addAttributes(fields)
-        layer.updateFields()
-        with edit(layer):
-            layer.addFeatures(filter(keep_feature, features))
-        return layer
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import collections.abc as c
 import json
 import string
 import typing as t
+from contextlib import contextmanager
 
 from qgis.PyQt.QtCore import (
-    QObject,
+    QSignalBlocker,
     QUrl,
 )
 from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
@@ -40,44 +42,45 @@ def add_completer_to_combo_box(combobox: QComboBox) -> None:
 
 
 def delete_layout_items(layout: QLayout | None) -> None:
-    if layout is not None:
+    # Nested layouts are emptied from a worklist instead of recursing
+    layouts = [layout]
+    while layouts:
+        layout = layouts.pop()
+        if layout is None:
+            continue
         while layout.count():
             item = layout.takeAt(0)
             widget = item.widget()
             if widget is not None:
                 widget.deleteLater()
             else:
-                delete_layout_items(item.layout())
+                layouts.append(item.layout())
 
 
 def parse_node_name(name: str) -> str:
-    if '<a href' in name:
-        name = name[: name.index('<a href')]
-    return fix_trailing_whitespace(name)
+    # partition scans the name once, the text before the link is kept
+    return name.partition('<a href')[0].rstrip(string.whitespace)
 
 
 def fix_trailing_whitespace(str_: str) -> str:
     return str_.rstrip(string.whitespace)
 
 
-T = t.TypeVar('T', bound=QObject)
+@contextmanager
+def updates_disabled(widget: QWidget) -> c.Iterator[None]:
+    """Defers repainting the widget until the block exits."""
+    widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        widget.setUpdatesEnabled(True)
 
 
-def get_children(parent: QWidget | QLayout, search_for: t.Type[T]) -> list[T]:
-    children = []
-    for child in parent.children():
-        if isinstance(child, search_for):
-            children.append(child)
-    return children
-
-
-def get_widgets(parent: QLayout, search_for: t.Type[T]) -> list[T]:
-    widgets = []
-    for i in range(parent.count()):
-        item = parent.itemAt(i).widget()
-        if item is not None and isinstance(item, search_for):
-            widgets.append(item)
-    return widgets
+@contextmanager
+def bulk_update(widget: QWidget) -> c.Iterator[None]:
+    """Updates the widget without repainting or emitting signals per item."""
+    with updates_disabled(widget), QSignalBlocker(widget):
+        yield
 
 
 def get_list_widget_items(list_widget: QListWidget) -> list[QListWidgetItem]:
@@ -87,6 +90,13 @@ def get_list_widget_items(list_widget: QListWidget) -> list[QListWidgetItem]:
     )
 
 
+def read_json(reply: QNetworkReply) -> t.Any:
+    """Decodes the body of a finished reply as JSON."""
+    # json.loads decodes the UTF-8 bytes itself, there is no need for an
+    # intermediate str copy of the payload.
+    return json.loads(reply.readAll().data())
+
+
 def update_node_ancestors_and_children(
     handler: RequestHandler, node: Node, url: str, text: str
 ) -> QNetworkReply:
@@ -95,40 +105,24 @@ def update_node_ancestors_and_children(
     reply = handler.get(request, text)
 
     def update_node():
-        data = reply.readAll().data()
-        node.update(json.loads(data))
+        node.update(read_json(reply))
 
     reply.finished.connect(update_node)
     return reply
 
 
-def get_tree_widget_items(
-    tree_widget: QTreeWidget | QTreeWidgetItem,
-) -> list[QTreeWidgetItem]:
-    if isinstance(tree_widget, QTreeWidget):
-        return t.cast(
-            list[QTreeWidgetItem],
-            [
-                tree_widget.topLevelItem(i)
-                for i in range(tree_widget.topLevelItemCount())
-            ],
-        )
-    elif isinstance(tree_widget, QTreeWidgetItem):
-        return t.cast(
-            list[QTreeWidgetItem],
-            [tree_widget.child(i) for i in range(tree_widget.childCount())],
-        )
-    raise ValueError(f'Did not expect {tree_widget!r}')
-
-
 def get_tree_widget_items_r(
     tree_widget: QTreeWidget | QTreeWidgetItem,
-) -> list[QTreeWidgetItem]:
-    items = []
-    if isinstance(tree_widget, QTreeWidgetItem):
-        items.append(tree_widget)
-    children = get_tree_widget_items(tree_widget)
-    if children:
-        for child in children:
-            items.extend(get_tree_widget_items_r(child))
-    return items
+) -> c.Iterator[QTreeWidgetItem]:
+    """Yields the items depth-first, in the order they are displayed."""
+    if isinstance(tree_widget, QTreeWidget):
+        stack = [
+            tree_widget.topLevelItem(i)
+            for i in reversed(range(tree_widget.topLevelItemCount()))
+        ]
+    else:
+        stack = [tree_widget]
+    while stack:
+        item = stack.pop()
+        yield item
+        stack.extend(item.child(i) for i in reversed(range(item.childCount())))
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from qgis.PyQt.QtCore import QItemSelection, QModelIndex, Qt
-from qgis.PyQt.QtGui import QFont
+import itertools
+
+from qgis.PyQt.QtCore import QItemSelection, QModelIndex, Qt, QTimer
+from qgis.PyQt.QtGui import QFont, QHideEvent
 from qgis.PyQt.QtWidgets import (
     QAbstractItemView,
     QDialog,
@@ -26,8 +28,10 @@ class QListWidgetAlwaysSelected(QListWidget):
     def _select_first_row(
         self, index: QModelIndex, first: int, last: int
     ) -> None:
+        # Only the first insertion selects a row, the slot then drops
+        # itself and leaves other rowsInserted connections alone
+        self.model().rowsInserted.disconnect(self._select_first_row)
         self.setCurrentRow(first)
-        self.model().rowsInserted.disconnect()
 
     def _get_first_visible_item(self) -> QListWidgetItem | None:
         for item in get_list_widget_items(self):
@@ -60,6 +64,24 @@ class LoadingDialog(QDialog):
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.label.setFont(QFont(self.label.font().family(), 15))
         self.layout().addWidget(self.label)
+        # The animation runs on the GUI thread, no thread is needed to
+        # wake up every half a second
+        self._prefix = ''
+        self._glyphs = itertools.cycle(('🌏  ', '🌍  ', '🌎  '))
+        self._timer = QTimer(self)
+        self._timer.setInterval(500)
+        self._timer.timeout.connect(self._spin)
+
+    def start_spin(self, text: str) -> None:
+        # Only the trailing glyph changes between ticks
+        self._prefix = f'{text}\n'
+        self._spin()
+        self._timer.start()
+        self.show()
+
+    def _spin(self) -> None:
+        self.label.setText(self._prefix + next(self._glyphs))
 
-    def update_loading_label(self, text: str) -> None:
-        self.label.setText(text)
+    def hideEvent(self, event: QHideEvent) -> None:
+        self._timer.stop()
+        super().hideEvent(event)
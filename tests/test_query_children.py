@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import types
+
+import pytest
+
+pytest.importorskip('qgis')
+pytest.importorskip('processing')
+
+from qgis.PyQt.QtWidgets import (  # noqa: E402
+    QApplication,
+    QListWidgetItem,
+    QWidget,
+)
+
+from qtempo.enums import QListWidgetItemRole  # noqa: E402
+from qtempo.qtempo import Dialog  # noqa: E402
+from qtempo.widgets import QListWidgetAlwaysSelected  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def add_items(widget, choices):
+    items_by_parent = {}
+    for nom_item_id, parent_id in choices:
+        item = QListWidgetItem(widget)
+        item.setData(
+            QListWidgetItemRole.CHOICE.value,
+            {'nomItemId': nom_item_id, 'parentId': parent_id},
+        )
+        if parent_id is not None:
+            item.setHidden(True)
+        items_by_parent.setdefault(parent_id, []).append(item)
+    return items_by_parent
+
+
+@pytest.fixture
+def dialog(app):
+    base = QWidget()
+    parent_widget = QListWidgetAlwaysSelected(base)
+    child_widget = QListWidgetAlwaysSelected(base)
+    parent_items = add_items(parent_widget, [(1, None), (2, None), (3, None)])
+    # The first child row is selected on insertion while still hidden
+    child_items = add_items(child_widget, [(20, 2), (10, 1), (11, 1)])
+    fake = types.SimpleNamespace(
+        base=base,
+        sender=lambda: parent_widget,
+        _query_list_widgets=[parent_widget, child_widget],
+        _query_items_by_parent=[parent_items, child_items],
+        _query_visible_parents=[{None}, set()],
+    )
+    parent_widget.itemSelectionChanged.connect(
+        lambda: Dialog.set_query_children_hidden(fake)
+    )
+    return fake
+
+
+def selected_ids(widget):
+    role = QListWidgetItemRole.CHOICE.value
+    return {item.data(role)['nomItemId'] for item in widget.selectedItems()}
+
+
+def test_initially_hidden_child_is_deselected(dialog):
+    parent_widget, child_widget = dialog._query_list_widgets
+    assert selected_ids(child_widget) == {20}
+    # Parent 2 never changes state, so only the sweep reaches its child
+    parent_widget.item(2).setSelected(True)
+    assert 20 not in selected_ids(child_widget)
+
+
+def test_selected_child_is_deselected_with_its_parent(dialog):
+    parent_widget, child_widget = dialog._query_list_widgets
+    parent_widget.item(1).setSelected(True)
+    child_widget.item(1).setSelected(True)
+    assert 10 in selected_ids(child_widget)
+    parent_widget.item(0).setSelected(False)
+    assert selected_ids(child_widget) == {20}
+    assert child_widget.item(1).isHidden()